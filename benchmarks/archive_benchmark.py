@@ -0,0 +1,99 @@
+"""
+Measures ArticleArchive append and keyword query latency on a synthetic archive.
+
+Run from the repository root:
+    python -m benchmarks.archive_benchmark [article_count]
+
+Defaults to 100,000 articles of ~250 words each. The database is written to a
+temporary directory and deleted afterwards.
+"""
+import os
+import sys
+import random
+import statistics
+import tempfile
+import time
+from models.article import Article
+from models.article_archive import ArticleArchive
+
+WORDS_PER_ARTICLE = 250
+QUERY_REPEATS = 20
+BACKFILL_LIMIT = 100 # Default backfill_max_articles in config.yaml
+
+# Common filler words plus rarer terms, so queries hit both large and small result sets
+VOCABULARY = [f"word{i}" for i in range(20000)]
+RARE_PHRASES = ["howard lutnick", "commerce secretary", "department of commerce", "export controls"]
+
+QUERIES = {
+    "rare phrase (~1%)": '"Howard Lutnick"',
+    "uncommon phrase (~5%)": '"Commerce Secretary"',
+    "common term": "word10",
+    "no matches": '"Secretary of Agriculture"',
+}
+
+
+def make_article(rng, i):
+    """
+    Builds a synthetic Article. Rare phrases are inserted into a small share of articles.
+    """
+    words = rng.choices(VOCABULARY[:2000], k=WORDS_PER_ARTICLE // 2) + rng.choices(VOCABULARY, k=WORDS_PER_ARTICLE // 2)
+    if rng.random() < 0.01:
+        words.insert(rng.randrange(len(words)), RARE_PHRASES[0])
+    if rng.random() < 0.05:
+        words.insert(rng.randrange(len(words)), RARE_PHRASES[1])
+    return Article(
+        title=" ".join(rng.choices(VOCABULARY, k=8)),
+        url=f"https://example.com/2025/article-{i}",
+        normalized_url=f"example.com/2025/article-{i}",
+        keyword='"Department of Commerce"',
+        content=" ".join(words),
+        source="Example",
+        scraped=True,
+    )
+
+
+def percentile(samples, pct):
+    return sorted(samples)[min(int(len(samples) * pct / 100), len(samples) - 1)]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = ArticleArchive(filepath=os.path.join(tmp, "archive.db"))
+
+        # Append one article per transaction, as main.run_queue does
+        start = time.perf_counter()
+        for i in range(count):
+            archive.add(make_article(rng, i))
+        elapsed = time.perf_counter() - start
+        print(f"Appended {count} articles in {elapsed:.1f}s ({elapsed / count * 1000:.2f} ms/article)")
+
+        archive.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        size_mb = os.path.getsize(archive.filepath) / 1024 / 1024
+        print(f"Database size: {size_mb:.1f} MB")
+
+        since = time.time() - 7 * 86400
+        for limit in (None, BACKFILL_LIMIT):
+            print(f"Queries with limit={limit}:")
+            for name, keyword in QUERIES.items():
+                timings = []
+                for _ in range(QUERY_REPEATS):
+                    start = time.perf_counter()
+                    results = archive.search(keyword, since=since, limit=limit)
+                    timings.append((time.perf_counter() - start) * 1000)
+                print(
+                    f"  {name:<24} {len(results):>6} hits  "
+                    f"p50 {statistics.median(timings):7.2f} ms  p95 {percentile(timings, 95):7.2f} ms"
+                )
+
+        start = time.perf_counter()
+        pruned = archive.prune(time.time() + 1)
+        print(f"Pruned {pruned} articles in {time.perf_counter() - start:.1f}s")
+
+        archive.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,17 @@
 import os
+import sys
+import time
 import yaml
 from dotenv import load_dotenv
 from services.google_searcher import GoogleSearcher
 from services.rss_fetcher import RssFetcher
 from services.web_scraper import WebScraper
-from utils import normalize_url
+from utils import normalize_url, normalize_keyword
 from models.duplicate_manager import DuplicateManager
 from models.article import Article
+from models.article_queue import ArticleQueue
+from models.subscription_index import SubscriptionIndex
+from models.article_archive import ArticleArchive
 from services.email_builder import EmailBuilder
 
 # Load environment variables from .env file
@@ -29,9 +34,30 @@ def main():
     rss_keywords = config.get('rss_keywords', [])
     api_keywords = config.get('api_keywords', [])
     rss_feeds = config.get('rss_feeds', {})
+    keyword_weights = config.get('keyword_weights', {})
+    run_budget = config.get('run_budget_seconds')
+    subscribers = config.get('subscribers', {})
+    default_recipients = config.get('default_recipients', [])
+    backfill_days = config.get('backfill_days', 7)
+
+    # Start the run clock; None means no deadline
+    deadline = time.monotonic() + run_budget if run_budget else None
         
     # Initialize managers and services
     manager = DuplicateManager()
+    queue = ArticleQueue(
+        keyword_weights=keyword_weights,
+        max_age_hours=config.get('pending_max_age_hours', 72),
+        max_pending=config.get('pending_max_articles', 500),
+    )
+    subscriptions = SubscriptionIndex(subscribers=subscribers, default_recipients=default_recipients)
+    archive = ArticleArchive()
+    archive.seed_keywords(api_keywords + rss_keywords)
+
+    # Backfill never looks further back than backfill_days, so older articles can go
+    pruned = archive.prune(time.time() - backfill_days * 86400)
+    if pruned:
+        print(f"Pruned {pruned} articles older than {backfill_days} days from the archive.")
     searcher = GoogleSearcher(api_key=api_key, cse_id=cse_id, keywords=api_keywords)
     rss_fetcher = RssFetcher(rss_urls=rss_feeds, keywords=rss_keywords)
     scraper = WebScraper()
@@ -43,20 +69,110 @@ def main():
     # Step 1.5: RSS fetching
     rss_articles = run_rss_fetch(rss_fetcher, manager)
 
-    # Combine Google search and RSS
-    all_new_articles = session_articles + rss_articles
+    # Combine articles deferred by the previous run with Google search and RSS
+    pending_articles = queue.load_pending()
+    all_new_articles = pending_articles + session_articles + rss_articles
 
     if not all_new_articles:
         print("No new articles found. Exiting.")
+        archive.close()
         return
 
-    # Step 2: Scrape articles
+    # Step 2: Scrape, send and archive articles in priority order within the run budget
     for article in all_new_articles:
-        handle_article_scrape(scraper, article)
+        queue.push(article)
 
-    # Step 3: Build and send email
-    for article in all_new_articles:
-        builder.build_email(article)
+    # Checkpoint the queue now: the new URLs are already marked as seen, so if the run
+    # dies before finishing, the pending file is the only record of these articles
+    queue.checkpoint()
+    try:
+        run_queue(queue, scraper, builder, subscriptions, archive, deadline)
+    finally:
+        # Always rewrite the pending file, so articles sent before a crash aren't sent again.
+        # Only what is left once sending stops is subject to expiry and the size cap.
+        deferred = queue.save_pending()
+        if deferred:
+            print(f"Deferred {deferred} articles to the next run.")
+        builder.close()
+        archive.close()
+
+def backfill():
+    """
+    Matches keywords added to config.yaml since the last backfill against the local archive
+    and queues matching articles for the next run. Uses no network.
+    """
+    with open('config.yaml', 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+
+    keywords = config.get('api_keywords', []) + config.get('rss_keywords', [])
+    backfill_days = config.get('backfill_days', 7)
+    backfill_limit = config.get('backfill_max_articles', 100)
+
+    archive = ArticleArchive()
+    subscriptions = SubscriptionIndex(
+        subscribers=config.get('subscribers', {}),
+        default_recipients=config.get('default_recipients', []),
+    )
+    queue = ArticleQueue(
+        keyword_weights=config.get('keyword_weights', {}),
+        max_age_hours=config.get('pending_max_age_hours', 72),
+        max_pending=config.get('pending_max_articles', 500),
+    )
+
+    try:
+        archive.seed_keywords(keywords)
+        new_keywords = archive.new_keywords(keywords)
+        if not new_keywords:
+            print("No new keywords to backfill. Exiting.")
+            return
+
+        # Keep articles already waiting to be sent
+        pending_articles = queue.load_pending()
+        for article in pending_articles:
+            queue.push(article)
+        queued = {article.normalized_url: article for article in pending_articles}
+
+        since = time.time() - backfill_days * 86400
+        evaluated = []
+        for keyword in new_keywords:
+            # Archived articles were already emailed, so only the new keyword's subscribers need them.
+            # Left unmarked so a later backfill runs once the keyword has subscribers.
+            if not subscriptions.by_keyword.get(normalize_keyword(keyword)):
+                print(f"[Backfill] No subscribers for keyword '{keyword}'. Skipping until it has some.")
+                continue
+            evaluated.append(keyword)
+
+            matches = archive.search(keyword, since=since, limit=backfill_limit)
+            print(f"[Backfill] Found {len(matches)} archived articles for keyword '{keyword}'.")
+
+            for article in matches:
+                # Already queued: add this keyword's subscribers to the same alert
+                existing = queued.get(article.normalized_url)
+                if existing is not None:
+                    alerted_for = existing.backfilled_from if existing.backfilled_from is not None else existing.keyword
+                    backfilled_for = [normalize_keyword(kw) for kw in existing.backfilled_for]
+                    if normalize_keyword(keyword) not in backfilled_for + [normalize_keyword(alerted_for)]:
+                        existing.backfilled_for.append(keyword)
+                    continue
+
+                # Skip articles already alerted for this keyword
+                if normalize_keyword(article.keyword) == normalize_keyword(keyword):
+                    continue
+                article.backfilled_from = article.keyword
+                article.keyword = keyword
+                article.backfilled_for = [keyword]
+
+                # Skip articles whose new keyword subscribers all received the original alert
+                if not subscriptions.match_backfill(article):
+                    continue
+                queue.push(article)
+                queued[article.normalized_url] = article
+
+        total = queue.save_pending()
+        archive.mark_keywords(evaluated)
+        print(f"[Backfill] {total - len(pending_articles)} articles queued for the next run.")
+    finally:
+        archive.close()
 
 def run_search(searcher, manager):
     """
@@ -91,11 +207,59 @@ def run_rss_fetch(rss_fetcher, manager):
 
     return new_articles
 
+def run_queue(queue, scraper, builder, subscriptions, archive, deadline):
+    """
+    Scrapes and emails articles one at a time, highest priority first, so the most
+    important alerts go out before the rest are scraped.
+    Each article is sent once to all of its subscribers, then added to the archive.
+    Backfilled articles go only to their new keyword's subscribers who didn't get the original alert.
+    Stops when the remaining time is shorter than the average time per article so far.
+    Each sent article is logged, so a killed run resends at most one article.
+    If the email login is rejected, stops and keeps the unsent articles for the next run.
+    """
+    processed = 0
+    total_elapsed = 0.0
+
+    while queue:
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            average = total_elapsed / processed if processed else 0.0
+            if remaining <= average:
+                break
+
+        start = time.monotonic()
+        article = queue.pop()
+        handle_article_scrape(scraper, article)
+        # Backfilled archive articles only go to new keyword subscribers; others may also have some
+        recipients = subscriptions.match_backfill(article)
+        if article.backfilled_from is None:
+            recipients = subscriptions.match(article) + recipients
+        builder.build_email(article, recipients)
+
+        # Without a working login nothing else can be sent; keep the rest for the next run
+        if builder.login_failed:
+            queue.push(article)
+            print(f"Email login failed. Stopping after {processed} articles.")
+            break
+
+        queue.mark_sent(article)
+        archive.add(article)
+
+        processed += 1
+        total_elapsed += time.monotonic() - start
+
+    if queue and not builder.login_failed:
+        print(f"Run budget reached after {processed} articles.")
+
 def handle_article_scrape(scraper, article):
     """
     Passes article's URL to scraping service.
     If scrape successful, adds new fields and passes to manager for saving.
+    Articles already scraped (e.g. queued by a backfill) are left as they are.
     """
+    if article.scraped:
+        return
+
     try:
         # Attempt to scrape
         article_data = scraper.scrape_url(article.url)
@@ -107,6 +271,7 @@ def handle_article_scrape(scraper, article):
         article.author = article_data["author"]
         article.pub_date = article_data["pub_date"]
         article.content = article_data["content"]
+        article.scraped = True
         print(f"Successfully scraped: {article.title}")
 
     except Exception as e:
@@ -114,4 +279,7 @@ def handle_article_scrape(scraper, article):
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if "--backfill" in sys.argv[1:]:
+        backfill()
+    else:
+        main()
\ No newline at end of file
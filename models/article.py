@@ -15,6 +15,11 @@ class Article:
     content: Optional[str] = None
     source: Optional[str] = None
     pub_date: Optional[str] = None
+    published_timestamp: Optional[float] = None
+    scraped: bool = False
+    queued_at: Optional[float] = None
+    backfilled_from: Optional[str] = None
+    backfilled_for: List[str] = field(default_factory=list)
     id: Optional[str] = None
 
     def __post_init__(self):
@@ -34,5 +39,10 @@ class Article:
             "author": self.author or [],
             "keyword": self.keyword,
             "content": self.content if self.content is not None else "",
-            "pub_date": self.pub_date if self.pub_date is not None else ""
+            "pub_date": self.pub_date if self.pub_date is not None else "",
+            "published_timestamp": self.published_timestamp,
+            "scraped": self.scraped,
+            "queued_at": self.queued_at,
+            "backfilled_from": self.backfilled_from,
+            "backfilled_for": self.backfilled_for
         }
\ No newline at end of file
@@ -0,0 +1,180 @@
+import os
+import json
+import sqlite3
+import time
+from models.article import Article
+from utils import normalize_keyword
+
+class ArticleArchive:
+    """
+    Local full-text archive of processed articles, stored in SQLite with an FTS5 index.
+    Lets new keywords be matched against recent coverage without searching or scraping again.
+    """
+    def __init__(self, filepath="data/archive.db"):
+        """
+        Initializes the ArticleArchive, creating the database if it doesn't exist.
+        @param filepath (str): Path to the SQLite database file.
+        """
+        self.filepath = filepath
+
+        # Ensure the directory exists before trying to open the database
+        if os.path.dirname(self.filepath):
+            os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+
+        self.conn = sqlite3.connect(self.filepath)
+        self.conn.row_factory = sqlite3.Row
+        self._create_tables()
+
+    def _create_tables(self):
+        """
+        Private method: creates the articles table, its FTS5 index and the evaluated keywords table.
+        The FTS5 table uses articles as external content, so text is stored only once.
+        """
+        self.conn.executescript("""
+            PRAGMA journal_mode = WAL;
+
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY,
+                normalized_url TEXT NOT NULL UNIQUE,
+                url TEXT NOT NULL,
+                title TEXT,
+                source TEXT,
+                author TEXT,
+                keyword TEXT,
+                pub_date TEXT,
+                published_timestamp REAL,
+                content TEXT,
+                scraped INTEGER NOT NULL DEFAULT 0,
+                archived_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS articles_archived_at ON articles (archived_at);
+
+            CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                title, content, content='articles', content_rowid='id'
+            );
+
+            CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+                INSERT INTO articles_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+                INSERT INTO articles_fts (articles_fts, rowid, title, content)
+                VALUES ('delete', old.id, old.title, old.content);
+            END;
+
+            CREATE TABLE IF NOT EXISTS keywords (
+                keyword TEXT PRIMARY KEY
+            );
+        """)
+
+    def add(self, article):
+        """
+        Appends an article to the archive. Articles already archived (by normalized URL) are ignored.
+        Returns True if the article was added.
+        """
+        with self.conn:
+            cursor = self.conn.execute(
+                """
+                INSERT OR IGNORE INTO articles (normalized_url, url, title, source, author, keyword,
+                    pub_date, published_timestamp, content, scraped, archived_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    article.normalized_url, article.url, article.title, article.source,
+                    json.dumps(article.author or []), article.keyword, article.pub_date,
+                    article.published_timestamp, article.content, int(article.scraped), time.time(),
+                ),
+            )
+        return cursor.rowcount > 0
+
+    def prune(self, before):
+        """
+        Deletes articles archived before the given timestamp, along with their index entries.
+        Freed space is reused by later appends rather than returned to the filesystem.
+        Returns the number of articles deleted.
+        """
+        with self.conn:
+            cursor = self.conn.execute("DELETE FROM articles WHERE archived_at < ?", (before,))
+        return cursor.rowcount
+
+    @staticmethod
+    def _to_fts_query(keyword):
+        """
+        Private method: turns a config keyword into an FTS5 phrase query.
+        Example: '"Howard Lutnick"' -> '"howard lutnick"'
+        """
+        return '"' + normalize_keyword(keyword).replace('"', '""') + '"'
+
+    def search(self, keyword, since=None, limit=None):
+        """
+        Returns archived Article objects whose title or content contains the keyword phrase,
+        newest first.
+        @param since (float): Only include articles archived at or after this timestamp.
+        @param limit (int): Maximum number of articles to return.
+        """
+        query = """
+            SELECT a.* FROM articles_fts
+            JOIN articles a ON a.id = articles_fts.rowid
+            WHERE articles_fts MATCH ? AND a.archived_at >= ?
+            ORDER BY a.archived_at DESC
+        """
+        params = [self._to_fts_query(keyword), since or 0]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        return [self._row_to_article(row) for row in self.conn.execute(query, params)]
+
+    @staticmethod
+    def _row_to_article(row):
+        """
+        Private method: rebuilds an Article from an archive row.
+        """
+        return Article(
+            title=row["title"],
+            url=row["url"],
+            normalized_url=row["normalized_url"],
+            keyword=row["keyword"],
+            author=json.loads(row["author"] or "[]"),
+            content=row["content"],
+            source=row["source"],
+            pub_date=row["pub_date"],
+            published_timestamp=row["published_timestamp"],
+            scraped=bool(row["scraped"]),
+        )
+
+    def seed_keywords(self, keywords):
+        """
+        Marks keywords as backfilled if no keyword has been recorded yet, so the keywords
+        configured when the archive is first used aren't treated as new by a later backfill.
+        """
+        if self.conn.execute("SELECT 1 FROM keywords LIMIT 1").fetchone() is None:
+            self.mark_keywords(keywords)
+
+    def new_keywords(self, keywords):
+        """
+        Returns the keywords that have not been backfilled yet, without duplicates.
+        """
+        evaluated = {row[0] for row in self.conn.execute("SELECT keyword FROM keywords")}
+        new = {}
+        for keyword in keywords:
+            normalized = normalize_keyword(keyword)
+            if normalized and normalized not in evaluated:
+                new.setdefault(normalized, keyword)
+        return list(new.values())
+
+    def mark_keywords(self, keywords):
+        """
+        Records keywords as backfilled so later backfills skip them.
+        """
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO keywords (keyword) VALUES (?)",
+                [(normalize_keyword(keyword),) for keyword in keywords],
+            )
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        self.conn.close()
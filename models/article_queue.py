@@ -0,0 +1,201 @@
+import os
+import json
+import heapq
+import itertools
+import time
+from datetime import datetime, timezone
+from models.article import Article
+from utils import SOURCE_MAP, normalize_keyword
+
+class ArticleQueue:
+    """
+    Priority queue of articles waiting to be scraped and sent.
+    Articles left over when a run's budget is spent are saved and picked up by the next run.
+    """
+    def __init__(self, keyword_weights=None, filepath="data/pending_articles.json", half_life_hours=6,
+                 max_age_hours=72, max_pending=500):
+        """
+        Initializes the ArticleQueue.
+        @param keyword_weights (dict): {keyword: weight} from config.yaml. Unlisted keywords weigh 1.
+        @param filepath (str): Path to the JSON file holding deferred articles.
+            Sent URLs are logged next to it (<filepath>.sent) between full rewrites.
+        @param half_life_hours (float): Age at which an article's recency score halves.
+        @param max_age_hours (float): Deferred articles older than this are dropped instead of saved.
+        @param max_pending (int): Maximum number of deferred articles saved; the lowest priority are dropped.
+        """
+        self.filepath = filepath
+        self.sent_log_path = filepath + ".sent"
+        self.half_life_hours = half_life_hours
+        self.max_age_hours = max_age_hours
+        self.max_pending = max_pending
+        self.keyword_weights = {
+            normalize_keyword(kw): float(weight)
+            for kw, weight in (keyword_weights or {}).items()
+        }
+        self.source_ranks = self._build_source_ranks()
+        self._heap = []
+        self._counter = itertools.count() # Tiebreaker: keeps discovery order among equal scores
+
+    def __len__(self):
+        return len(self._heap)
+
+    @staticmethod
+    def _build_source_ranks():
+        """
+        Private method: scores sources by their position in SOURCE_MAP (first = 1.0, last > 0).
+        Both domain keys and display names are mapped, since RSS articles carry the
+        feed name and scraped articles carry the formatted source title.
+        """
+        total = len(SOURCE_MAP)
+        ranks = {}
+        for position, (domain, name) in enumerate(SOURCE_MAP.items()):
+            score = (total - position) / total
+            ranks[domain.lower()] = score
+            ranks[name.lower()] = score
+        return ranks
+
+    def _published_timestamp(self, article):
+        """
+        Private method: returns the article's publish time as a UTC timestamp, or None if unknown.
+        Prefers the RSS timestamp, then falls back to the scraped M/D/YYYY pub_date.
+        """
+        if article.published_timestamp is not None:
+            return article.published_timestamp
+        if article.pub_date:
+            try:
+                dt = datetime.strptime(article.pub_date, "%m/%d/%Y")
+                return dt.replace(tzinfo=timezone.utc).timestamp()
+            except ValueError:
+                return None
+        return None
+
+    def score(self, article):
+        """
+        Returns the article's priority (higher is more urgent).
+        Score = keyword weight * (1 + source rank) * (1 + recency), where recency
+        decays from 1 to 0 with the configured half-life. Unknown dates count as 0.5.
+        """
+        keyword_weight = self.keyword_weights.get(normalize_keyword(article.keyword), 1.0)
+        source_rank = self.source_ranks.get((article.source or "").lower(), 0.0)
+
+        published = self._published_timestamp(article)
+        if published is None:
+            recency = 0.5
+        else:
+            age_hours = max(time.time() - published, 0) / 3600
+            recency = 0.5 ** (age_hours / self.half_life_hours)
+
+        return keyword_weight * (1 + source_rank) * (1 + recency)
+
+    def push(self, article):
+        """
+        Adds an article to the queue, recording when it was first queued.
+        """
+        if article.queued_at is None:
+            article.queued_at = time.time()
+        heapq.heappush(self._heap, (-self.score(article), next(self._counter), article))
+
+    def pop(self):
+        """
+        Removes and returns the highest-priority article.
+        """
+        return heapq.heappop(self._heap)[2]
+
+    def load_pending(self):
+        """
+        Returns the list of articles deferred by the previous run, minus any logged as sent
+        after the file was last written.
+        An unreadable file is moved aside (not deleted) so its articles can be recovered.
+        """
+        if not os.path.exists(self.filepath):
+            return []
+        try:
+            with open(self.filepath, 'r', encoding='utf-8') as f:
+                articles = [Article(**data) for data in json.load(f)]
+        except Exception as e:
+            corrupt_path = self.filepath + ".corrupt"
+            os.replace(self.filepath, corrupt_path)
+            print(f"Failed to load pending articles from {self.filepath}: {e}. Moved it to {corrupt_path}.")
+            return []
+
+        sent_urls = self._load_sent_urls()
+        return [article for article in articles if article.normalized_url not in sent_urls]
+
+    def _load_sent_urls(self):
+        """
+        Private method: loads the URLs logged by mark_sent since the last full write.
+        """
+        if not os.path.exists(self.sent_log_path):
+            return set()
+        with open(self.sent_log_path, 'r', encoding='utf-8') as f:
+            return {line.strip() for line in f}
+
+    def mark_sent(self, article):
+        """
+        Appends the article's URL to the sent log, so a run that dies after sending it
+        doesn't leave it in the pending file for the next run. Much cheaper than a full rewrite.
+        """
+        # Ensure the directory exists before trying to open the file
+        os.makedirs(os.path.dirname(self.sent_log_path), exist_ok=True)
+
+        with open(self.sent_log_path, 'a', encoding='utf-8') as f:
+            f.write(article.normalized_url + '\n')
+
+    def _write_pending(self, articles):
+        """
+        Private method: replaces the pending file with the given articles and clears the sent log,
+        which the new file already accounts for.
+        Writes to a temporary file first so a crash never leaves a truncated file behind.
+        """
+        # Ensure the directory exists before trying to open the file
+        os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+
+        temp_path = self.filepath + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump([article.to_dict() for article in articles], f, indent=2)
+        os.replace(temp_path, self.filepath)
+
+        if os.path.exists(self.sent_log_path):
+            os.remove(self.sent_log_path)
+
+    def checkpoint(self):
+        """
+        Writes every article in the queue to the pending file, highest priority first.
+        Unlike save_pending, never drops articles from the queue.
+        """
+        self._write_pending([entry[2] for entry in sorted(self._heap)])
+
+    def save_pending(self):
+        """
+        Writes the articles still in the queue to the file, highest priority first,
+        replacing whatever was there. Returns the number saved.
+        Articles older than max_age_hours (by publish time, or queue time if unknown or backfilled) and
+        those beyond the max_pending highest-priority ones are dropped from the queue.
+        Call once a run has stopped sending; use checkpoint while it is still running.
+        """
+        kept = []
+        expired = []
+        now = time.time()
+        for entry in sorted(self._heap):
+            article = entry[2]
+            # Backfilled articles are old by design, so they age from when they were queued
+            published = None if article.backfilled_from is not None else self._published_timestamp(article)
+            age_hours = (now - (published if published is not None else article.queued_at or now)) / 3600
+            if age_hours > self.max_age_hours:
+                expired.append(article)
+            else:
+                kept.append(entry)
+
+        overflow = [entry[2] for entry in kept[self.max_pending:]]
+        kept = kept[:self.max_pending]
+
+        for article in expired:
+            print(f"Dropping deferred article older than {self.max_age_hours}h: {article.title}")
+        for article in overflow:
+            print(f"Dropping deferred article beyond the {self.max_pending}-article limit: {article.title}")
+
+        # Dropped articles leave the queue too; a sorted list is already a valid heap
+        self._heap = kept
+        pending = [entry[2] for entry in kept]
+        self._write_pending(pending)
+        return len(pending)
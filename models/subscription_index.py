@@ -0,0 +1,66 @@
+from utils import normalize_keyword, normalize_source
+
+class SubscriptionIndex:
+    """
+    Maps keywords and sources to the recipients subscribed to them,
+    so matching an article is a pair of dict lookups instead of a scan over every subscriber.
+    """
+    def __init__(self, subscribers=None, default_recipients=None):
+        """
+        Initializes the SubscriptionIndex.
+        @param subscribers (dict): {"keywords": {keyword: [emails]}, "sources": {source: [emails]}} from config.yaml.
+        @param default_recipients (list): Emails that receive articles no one else is subscribed to.
+        """
+        subscribers = subscribers or {}
+        self.by_keyword = self._build_index(subscribers.get('keywords', {}), normalize_keyword)
+        self.by_source = self._build_index(subscribers.get('sources', {}), normalize_source)
+        self.default_recipients = list(dict.fromkeys(default_recipients or []))
+
+        total = len({email for index in (self.by_keyword, self.by_source) for emails in index.values() for email in emails})
+        print(f"[SubscriptionIndex] Indexed {total} subscribers across {len(self.by_keyword)} keywords and {len(self.by_source)} sources.")
+
+    @staticmethod
+    def _build_index(subscriptions, normalize):
+        """
+        Private method: builds {normalized key: [emails]} with duplicates removed, preserving order.
+        """
+        index = {}
+        for key, emails in (subscriptions or {}).items():
+            index.setdefault(normalize(key), []).extend(emails or [])
+        return {key: list(dict.fromkeys(emails)) for key, emails in index.items()}
+
+    def _route(self, keyword, source):
+        """
+        Private method: returns keyword subscribers, then source subscribers, without duplicates.
+        Falls back to the default recipients if no one matches.
+        """
+        recipients = self.by_keyword.get(normalize_keyword(keyword), []) \
+            + self.by_source.get(normalize_source(source), [])
+        return list(dict.fromkeys(recipients)) or self.default_recipients
+
+    def match(self, article):
+        """
+        Returns the list of recipients for an article: keyword subscribers, then source
+        subscribers, without duplicates. Falls back to the default recipients if no one matches.
+        """
+        return self._route(article.keyword, article.source)
+
+    def match_backfill(self, article):
+        """
+        Returns the extra recipients a backfill added to an article: subscribers of each keyword
+        in article.backfilled_for who aren't already getting it. For an archived article
+        (backfilled_from set) that excludes whoever was routed the original alert; for an unsent
+        pending article, whoever match() returns. Never falls back to the default recipients.
+        """
+        if article.backfilled_from is not None:
+            already_sent = set(self._route(article.backfilled_from, article.source))
+        else:
+            already_sent = set(self.match(article))
+
+        recipients = [
+            email
+            for keyword in article.backfilled_for
+            for email in self.by_keyword.get(normalize_keyword(keyword), [])
+            if email not in already_sent
+        ]
+        return list(dict.fromkeys(recipients))
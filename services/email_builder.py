@@ -4,6 +4,9 @@ from email.message import EmailMessage
 from utils import format_for_html
 
 class EmailBuilder:
+    # Office 365 rejects messages with more than 500 recipients
+    MAX_RECIPIENTS_PER_MESSAGE = 500
+
     def __init__(self, from_address: str, password: str):
         """
         Initializes the EmailBuilder.
@@ -12,34 +15,71 @@ class EmailBuilder:
         self.template = self.env.get_template("email_template.html")
         self.from_address = from_address
         self.password = password
+        self.server = None # Shared SMTP connection, opened on first send
+        self.login_failed = False # Set on a rejected login; no further attempts are made this run
 
-    @staticmethod
-    def _send_email(subject: str, html_body: str, to_address: str, from_address: str, password: str):
+    def _connect(self):
         """
-        Opens a new Outlook draft with the given subject and HTML body.
+        Opens and logs in to Office 365's SMTP server, reusing the connection if already open.
+        Closes the socket if TLS or login fails, so failed attempts don't leak connections.
+        A rejected login sets login_failed, so repeated attempts can't lock the account.
         """
-        try:
-            # Draft email
-            email = EmailMessage()
-            email['Subject'] = subject
-            email['From'] = from_address
-            email['To'] = to_address
-            email.add_alternative(html_body, subtype='html')
-
-            # Connect to Office 365's SMTP server and send email
-            with smtplib.SMTP('smtp.office365.com', 587) as server:
+        if self.server is None:
+            server = smtplib.SMTP('smtp.office365.com', 587)
+            try:
                 server.starttls() # Start TLS encryption
-                server.login(from_address, password)
-                server.send_message(email)
+                server.login(self.from_address, self.password)
+            except Exception as e:
+                server.close()
+                if isinstance(e, smtplib.SMTPAuthenticationError):
+                    self.login_failed = True
+                raise
+            self.server = server
+        return self.server
 
-        except Exception as e:
-            print(f"Error sending email: {e}")
+    def close(self):
+        """
+        Closes the SMTP connection, if open.
+        """
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except (smtplib.SMTPException, OSError):
+                self.server.close()
+            self.server = None
 
+    def _send_email(self, subject: str, html_body: str, recipients: list):
+        """
+        Sends the given subject and HTML body to all recipients, one SMTP transaction per
+        MAX_RECIPIENTS_PER_MESSAGE recipients. Recipients are Bcc'd so they don't see each other.
+        Reconnects once if the server dropped the shared connection.
+        """
+        # Draft email
+        email = EmailMessage()
+        email['Subject'] = subject
+        email['From'] = self.from_address
+        email['To'] = self.from_address
+        email.add_alternative(html_body, subtype='html')
+
+        for i in range(0, len(recipients), self.MAX_RECIPIENTS_PER_MESSAGE):
+            batch = recipients[i:i + self.MAX_RECIPIENTS_PER_MESSAGE]
+            try:
+                self._connect().send_message(email, to_addrs=batch)
+            except smtplib.SMTPServerDisconnected:
+                self.server = None
+                self._connect().send_message(email, to_addrs=batch)
 
-    def build_email(self, article):
+    def build_email(self, article, recipients):
         """
-        Builds email html for a single article and creates outlook draft
+        Renders email html for a single article once and sends it to every recipient
         """
+        if self.login_failed:
+            return False
+
+        if not recipients:
+            print(f"No recipients subscribed to {article.title}. Skipping email.")
+            return False
+
         try:
             # Prepare article's data for the template
             article_dict = article.to_dict()
@@ -55,11 +95,12 @@ class EmailBuilder:
             # Create subject line
             subject = f"NEWS ALERT: {article.title}"
 
-            # Create and send email
-            self._send_email(subject=subject, html_body=html, to_address="example@domain.com", from_address=self.from_address, password=self.password)
+            # Send email
+            self._send_email(subject=subject, html_body=html, recipients=recipients)
+            print(f"Sent {article.title} to {len(recipients)} recipients.")
             
             return True
         
         except Exception as e:
-            print(f"Failed to create draft for {article.title}. Error: {e}")
-            return False
\ No newline at end of file
+            print(f"Failed to send email for {article.title}. Error: {e}")
+            return False
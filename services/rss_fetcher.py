@@ -2,6 +2,7 @@ import feedparser
 from models.article import Article
 from utils import normalize_url
 import time
+import calendar
 
 class RssFetcher:
     def __init__(self, rss_urls, keywords):
@@ -82,6 +83,7 @@ class RssFetcher:
                     summary = entry.get("summary", "") or entry.get("description", "")
                     link = entry.get("link", "")
                     normalized_url = normalize_url(link)
+                    published = entry.get('published_parsed') or entry.get('updated_parsed')
 
                     article = Article(
                         url=link,
@@ -91,6 +93,7 @@ class RssFetcher:
                         content=summary,
                         author=None,
                         pub_date=None,
+                        published_timestamp=calendar.timegm(published) if published else None,
                         keyword=matched_keyword
                     )
                     articles.append(article)
@@ -34,6 +34,20 @@ def normalize_url(url):
     path = parsed.path.rstrip('/') # remove trailing slash
     return f"{domain}{path}"
 
+def normalize_keyword(keyword):
+    """Lowercases and strips quotes so RSS (lowercased) and API keywords compare equal.
+    Example: '"Howard Lutnick"' -> 'howard lutnick'
+    """
+    return (keyword or "").strip().strip('"').lower()
+
+def normalize_source(source):
+    """Maps a source to its lowercased display name, whether given as a SOURCE_MAP
+    domain key (RSS feed name) or a formatted title (scraped source).
+    Example: 'foxnews' -> 'fox news', 'Fox News' -> 'fox news'
+    """
+    source = (source or "").strip().lower()
+    return SOURCE_MAP.get(source, source).lower()
+
 def is_potential_article(url, title):
     """
     Determines if a result is likely to be a news article using layered checks.